@@ -1,23 +1,131 @@
 import json
 from pathlib import Path
+
+import pandas as pd
 import streamlit as st
 
+# orjson parses large JSON files a few times faster than stdlib json and
+# consumes bytes directly; fall back to json when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# resolved once at import; render() runs on every rerun and should not pay
+# the stat/realpath cost repeatedly
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_TC_NDJSON = _REPO_ROOT / "Reports" / "test_cases.ndjson"
+_TC_FILE = _REPO_ROOT / "Reports" / "test_cases.json"
+
+
+def _data_file() -> Path:
+    """Saved test-cases file: JSON Lines when present, legacy array otherwise."""
+    return _TC_NDJSON if _TC_NDJSON.exists() else _TC_FILE
+
+
+@st.cache_data(show_spinner=False)
+def _load_records(path: str, mtime: float):
+    """Parse the saved test-cases JSON.
+
+    Cached per (path, mtime) so Streamlit reruns triggered by widget
+    interactions skip the disk read and JSON parse until the file changes.
+    """
+    raw = Path(path).read_bytes()
+    loads = orjson.loads if orjson is not None else json.loads
+    if path.endswith(".ndjson"):
+        # one record per line
+        return [loads(line) for line in raw.splitlines() if line.strip()]
+    return loads(raw)
+
+
+@st.cache_data(show_spinner=False)
+def _raw_json_bytes(path: str, mtime: float) -> bytes:
+    """Raw file bytes for the download button, cached per file version."""
+    return Path(path).read_bytes()
+
+
+def _get_field(rec, key):
+    return rec.get(key) if isinstance(rec, dict) else None
+
+
+@st.cache_data(show_spinner=False)
+def _aggregate(path: str, mtime: float):
+    """Derive the summary tallies (and DataFrame, if pandas is present).
+
+    Pure function of the file contents, so it is cached per (path, mtime)
+    like _load_records; widget-driven reruns reuse the prebuilt frame and
+    counts instead of re-aggregating.
+    """
+    data = _load_records(path, mtime)
+    if isinstance(data, dict):
+        records = [data]
+    elif isinstance(data, list):
+        records = data
+    else:
+        records = []
+
+    # Partition out non-dict entries once so the hot loops below (and the
+    # DataFrame build) can skip per-record isinstance checks.
+    records = [r for r in records if isinstance(r, dict)]
+
+    df = None
+    # `if records` guards the build: no point constructing (and dtype-probing)
+    # an empty DataFrame just to find out it is empty
+    if records:
+        try:
+            df = pd.DataFrame(records)
+        except Exception:
+            df = None
+
+    if df is not None:
+        def _col(name):
+            if name in df.columns:
+                return df[name].fillna("<Unknown>").astype(str).replace("", "<Unknown>")
+            return pd.Series(["<Unknown>"] * len(df), dtype=str)
+
+        module_col = _col("Module")
+        status_col = _col("Status")
+        type_col = _col("Test Case Type")
+        modules = module_col.tolist()
+        statuses = status_col.tolist()
+        types = type_col.tolist()
+        module_vc = module_col.value_counts()
+        status_vc = status_col.value_counts()
+        # pd.unique hashes in C; sorting the handful of distinct values is cheap
+        unique_modules = sorted(pd.unique(module_col))
+        unique_statuses = sorted(pd.unique(status_col))
+        unique_types = sorted(pd.unique(type_col))
+    else:
+        # no records (or an unbuildable frame): empty views
+        modules, statuses, types = [], [], []
+        module_vc = status_vc = None
+        unique_modules, unique_statuses, unique_types = [], [], []
+
+    return {
+        "df": df,
+        "modules": modules,
+        "statuses": statuses,
+        "types": types,
+        "module_vc": module_vc,
+        "status_vc": status_vc,
+        "unique_modules": unique_modules,
+        "unique_statuses": unique_statuses,
+        "unique_types": unique_types,
+    }
+
 
 def render():
     """Render the Reports page using only Reports/test_cases.json as the source."""
     st.header("Reports")
-    st.write("Visualize test cases stored in `Reports/test_cases.json`.")
-
-    repo_root = Path(__file__).resolve().parents[1]
-    testcases_file = repo_root / "Reports" / "test_cases.json"
+    st.write("Visualize test cases stored in `Reports/test_cases.ndjson`.")
 
-    if not testcases_file.exists():
+    tc_file = _data_file()
+    if not tc_file.exists():
         st.info("No saved test cases found. Generate some from the Test Case Generation page first.")
         return
 
     try:
-        with testcases_file.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _load_records(str(tc_file), tc_file.stat().st_mtime)
     except Exception as e:
         st.error(f"Failed to read test cases file: {e}")
         return
@@ -28,153 +136,177 @@ def render():
     elif isinstance(data, list):
         records = data
     else:
-        st.error("Unexpected data format in test_cases.json")
+        st.error("Unexpected data format in the saved test cases file")
         return
 
-    # optional pandas for nicer table display
-    try:
-        import pandas as pd
-    except Exception:
-        pd = None
-
-    # small helper
-    def get_field(rec, key):
-        return rec.get(key) if isinstance(rec, dict) else None
+    # drop non-dict entries up front; every loop below can then use plain
+    # dict access without re-checking types per record
+    records = [r for r in records if isinstance(r, dict)]
 
     # Summary at top
-    modules = [get_field(r, "Module") or "<Unknown>" for r in records]
-    statuses = [get_field(r, "Status") or "<Unknown>" for r in records]
-    types = [get_field(r, "Test Case Type") or "<Unknown>" for r in records]
     total = len(records)
 
+    # All pure aggregation lives in the cached _aggregate helper; reruns
+    # reuse its output until the file changes.
+    agg = _aggregate(str(tc_file), tc_file.stat().st_mtime)
+    modules = agg["modules"]
+    statuses = agg["statuses"]
+    types = agg["types"]
+    module_vc = agg["module_vc"]
+    status_vc = agg["status_vc"]
+
     st.subheader("Summary")
     col1, col2, col3 = st.columns(3)
     col1.metric("Total test cases", total)
-    try:
-        from collections import Counter
-
-        top_module, top_module_count = Counter(modules).most_common(1)[0]
-    except Exception:
+    if module_vc is not None and len(module_vc) and len(status_vc):
+        top_module, top_module_count = module_vc.index[0], int(module_vc.iloc[0])
+        top_status, top_status_count = status_vc.index[0], int(status_vc.iloc[0])
+    else:
+        # value_counts is absent only when there are no records at all
         top_module, top_module_count = "-", 0
-    try:
-        top_status, top_status_count = Counter(statuses).most_common(1)[0]
-    except Exception:
         top_status, top_status_count = "-", 0
 
     col2.metric("Top module", f"{top_module} ({top_module_count})")
     col3.metric("Top status", f"{top_status} ({top_status_count})")
 
-    # # Single download button for the saved JSON
-    # try:
-    #     with testcases_file.open("rb") as _f:
-    #         raw_json_bytes = _f.read()
-    #     st.download_button(
-    #         "Download saved JSON",
-    #         data=raw_json_bytes,
-    #         file_name="test_cases.json",
-    #         mime="application/json",
-    #     )
-    # except Exception:
-    #     # If read fails, don't block the UI
-    #     pass
+    # Single download button for the saved JSON; the bytes come from a cached
+    # producer so reruns don't re-read the file just to offer the download
+    try:
+        st.download_button(
+            "Download saved JSON",
+            data=_raw_json_bytes(str(tc_file), tc_file.stat().st_mtime),
+            file_name=tc_file.name,
+            mime="application/x-ndjson" if tc_file.suffix == ".ndjson" else "application/json",
+        )
+    except Exception:
+        # If read fails, don't block the UI
+        pass
 
     st.markdown("---")
 
-    # Sidebar filters
+    # Filters, charts and the table rerun as one fragment: changing a filter
+    # re-executes only this block, not the whole page script.
+    _filters_and_charts(records, agg)
+
+
+@st.fragment
+def _filters_and_charts(records, agg):
+    """Sidebar filters plus the charts/table driven by them."""
+    modules = agg["modules"]
+    statuses = agg["statuses"]
+    types = agg["types"]
+
+    # Sidebar filters; the sorted unique values come precomputed (and cached)
+    # from _aggregate instead of being rebuilt per rerun
     st.sidebar.header("Filters")
-    unique_modules = sorted({m for m in modules if m is not None})
+    unique_modules = agg["unique_modules"]
     selected_modules = st.sidebar.multiselect("Module", unique_modules, default=unique_modules)
-    unique_status = sorted({s for s in statuses if s is not None})
+    unique_status = agg["unique_statuses"]
     selected_status = st.sidebar.multiselect("Status", unique_status, default=unique_status)
-    unique_types = sorted({t for t in types if t is not None})
+    unique_types = agg["unique_types"]
     selected_types = st.sidebar.multiselect("Test Case Type", unique_types, default=unique_types)
 
-    def record_matches(r):
-        m = get_field(r, "Module") or "<Unknown>"
-        s = get_field(r, "Status") or "<Unknown>"
-        t = get_field(r, "Test Case Type") or "<Unknown>"
-        return (m in selected_modules) and (s in selected_status) and (t in selected_types)
-
-    filtered = [r for r in records if record_matches(r)]
-
-    st.subheader("Charts")
-
-    # Compute Positive/Negative counts and Module counts, then show side-by-side
-    from collections import Counter
-
-    # Positive/Negative counts from filtered records
-    pn_ctr = Counter()
-    for r in filtered:
-        if not isinstance(r, dict):
-            continue
-        t = (r.get("Test Case Type") or "").strip().lower()
-        if t.startswith("positive"):
-            pn_ctr["Positive"] += 1
-        elif t.startswith("negative"):
-            pn_ctr["Negative"] += 1
-        else:
-            pn_ctr["Other"] += 1
-
-    # Module counts (use pandas if available for accurate counts)
-    module_counts = None
-    mc_fallback = None
-    if pd is not None:
-        try:
-            df_tmp = pd.DataFrame(filtered)
-            if not df_tmp.empty and "Module" in df_tmp.columns:
-                module_counts = df_tmp["Module"].fillna("<Unknown>").value_counts()
-        except Exception:
+    # the three membership tests run as vectorized isin masks over the
+    # precomputed columns; isin hashes each selection list once
+    if records:
+        mask = (
+            pd.Series(modules).isin(selected_modules)
+            & pd.Series(statuses).isin(selected_status)
+            & pd.Series(types).isin(selected_types)
+        )
+        filtered = [r for r, keep in zip(records, mask.to_numpy()) if keep]
+    else:
+        filtered = []
+
+    # Charts sit behind a toggle inside the expander: collapsing an
+    # expander only hides already-rendered elements client-side, but
+    # turning the toggle off skips the chart build entirely and ships
+    # nothing to the frontend
+    df_f = None
+    with st.expander("Charts", expanded=True):
+        if st.toggle("Show charts", value=True):
+            # Compute Positive/Negative counts and Module counts, then show side-by-side
+
+            # One DataFrame over the filtered records feeds both charts
+            if filtered:
+                try:
+                    df_f = pd.DataFrame(filtered)
+                except Exception:
+                    df_f = None
+
+            # Positive/Negative counts via vectorized str ops
+            if df_f is not None and "Test Case Type" in df_f.columns:
+                t = df_f["Test Case Type"].fillna("").astype(str).str.strip().str.lower()
+                # one compiled-regex pass classifies every row; cheaper than a
+                # startswith scan per outcome label
+                cls = t.str.extract(r"^(positive|negative)", expand=False).str.capitalize().fillna("Other")
+                vc = cls.value_counts()
+                pn_ctr = {k: int(vc.get(k, 0)) for k in ("Positive", "Negative", "Other")}
+            else:
+                pn_ctr = {}
+
+            # Module counts
             module_counts = None
-    if module_counts is None:
-        mc_fallback = Counter([get_field(r, "Module") or "<Unknown>" for r in filtered])
-
-    left, right = st.columns(2)
-
-    with left:
-        pie_rows = []
-        for k in ("Positive", "Negative", "Other"):
-            if pn_ctr.get(k):
-                pie_rows.append({"label": k, "count": int(pn_ctr[k])})
-
-        if pie_rows:
-            st.markdown("**Positive vs Negative test cases**")
-            spec = {
-                "mark": {"type": "arc", "innerRadius": 20},
-                "encoding": {
-                    "theta": {"field": "count", "type": "quantitative"},
-                    "color": {
-                        "field": "label",
-                        "type": "nominal",
-                        "scale": {"domain": ["Positive", "Negative", "Other"], "range": ["#2ecc71", "#ff4d4f", "#d0d0d0"]},
+            if df_f is not None and "Module" in df_f.columns:
+                try:
+                    module_counts = df_f["Module"].fillna("<Unknown>").value_counts()
+                except Exception:
+                    module_counts = None
+
+            pie_rows = []
+            for k in ("Positive", "Negative", "Other"):
+                if pn_ctr.get(k):
+                    pie_rows.append({"label": k, "count": int(pn_ctr[k])})
+
+            mod_rows = []
+            if module_counts is not None:
+                mod_rows = [{"module": str(m), "count": int(c)} for m, c in module_counts.items()]
+
+            # Both charts ship as one hconcat spec: a single websocket payload and
+            # one Vega view mount instead of two. The row counts are tiny (distinct
+            # labels/modules), so inlining the values per sub-chart is cheap.
+            subspecs = []
+            if pie_rows:
+                subspecs.append({
+                    "title": "Positive vs Negative",
+                    "data": {"values": pie_rows},
+                    "mark": {"type": "arc", "innerRadius": 20},
+                    "encoding": {
+                        "theta": {"field": "count", "type": "quantitative"},
+                        "color": {
+                            "field": "label",
+                            "type": "nominal",
+                            "scale": {"domain": ["Positive", "Negative", "Other"], "range": ["#2ecc71", "#ff4d4f", "#d0d0d0"]},
+                        },
+                        "tooltip": [{"field": "label"}, {"field": "count", "type": "quantitative"}],
                     },
-                    "tooltip": [{"field": "label"}, {"field": "count", "type": "quantitative"}],
-                },
-            }
-            try:
-                st.vega_lite_chart(pie_rows, spec, use_container_width=True)
-            except Exception:
-                st.write(dict(pn_ctr))
-        else:
-            st.write("No Positive/Negative data to display")
-
-    with right:
-        st.markdown("**Test cases by Module**")
-        if module_counts is not None:
-            st.bar_chart(module_counts)
-        else:
-            if not mc_fallback:
-                st.info("No test cases match the selected filters.")
+                })
+            if mod_rows:
+                subspecs.append({
+                    "title": "Test cases by Module",
+                    "data": {"values": mod_rows},
+                    "mark": "bar",
+                    "encoding": {
+                        "x": {"field": "module", "type": "nominal", "sort": "-y"},
+                        "y": {"field": "count", "type": "quantitative"},
+                        "tooltip": [{"field": "module"}, {"field": "count", "type": "quantitative"}],
+                    },
+                })
+
+            if subspecs:
+                try:
+                    st.vega_lite_chart(None, {"hconcat": subspecs}, use_container_width=True)
+                except Exception:
+                    st.write(dict(pn_ctr))
             else:
-                st.write(dict(mc_fallback))
+                st.info("No test cases match the selected filters.")
 
     st.markdown("---")
     st.subheader("Test cases")
     try:
-        if pd is not None:
-            df_all = pd.DataFrame(filtered)
-            st.dataframe(df_all)
-        else:
-            st.table(filtered)
+        # reuse the frame the charts section already built from the same rows
+        df_all = df_f if df_f is not None else pd.DataFrame(filtered)
+        st.dataframe(df_all, use_container_width=True)
     except Exception:
         st.write(filtered)
     
@@ -1,11 +1,12 @@
 import json
-import urllib.request
-import urllib.error
+import re
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 
+import pandas as pd
+import requests
 import streamlit as st
-import concurrent.futures
 import time
-import socket
 import os
 import tempfile
 from pathlib import Path
@@ -14,6 +15,157 @@ import random
 
 WEBHOOK_URL = "https://natasha1.app.n8n.cloud/webhook/f6d8b7ed-cf2f-48d1-adb4-fe7a78694981"
 
+# resolved once at import; render() runs on every rerun and should not pay
+# the stat/realpath cost repeatedly
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_REPORTS_DIR = _REPO_ROOT / "Reports"
+
+# "<prefix>_<number>" Test Case IDs, e.g. "SG_12"; compiled once at import
+_TCID_RE = re.compile(r"([^_]+)_?(\d+)$")
+
+# orjson (C-accelerated) when available, stdlib json otherwise. Both helpers
+# work in bytes so callers skip the str encode/decode round-trip.
+try:
+    import orjson
+
+    def _jloads(data):
+        return orjson.loads(data)
+
+    def _jdumpb(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def _jloads(data):
+        return json.loads(data)
+
+    def _jdumpb(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@st.cache_resource
+def _executor():
+    """Shared worker pool for webhook calls, one per Streamlit process."""
+    return ThreadPoolExecutor(max_workers=4)
+
+
+@st.cache_resource
+def _http_session():
+    """One keep-alive session per Streamlit process.
+
+    Repeated submissions reuse the pooled TLS connection to the webhook
+    instead of paying a fresh TCP + TLS handshake per POST.
+    """
+    s = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4)
+    s.mount("https://", adapter)
+    return s
+
+
+def _post_webhook(payload):
+    """Blocking POST to the n8n webhook; runs on a worker thread.
+
+    Returns the stripped response body; raises requests exceptions on
+    HTTP or network failure so the polling fragment can report them.
+    """
+    resp = _http_session().post(WEBHOOK_URL, json=payload, timeout=60)
+    resp.raise_for_status()
+    return resp.text.strip()
+
+
+@st.cache_data(ttl="5m", max_entries=8, show_spinner=False)
+def _load_saved_records(path: str, mtime: float):
+    """Load and normalize saved records (JSON Lines, or a legacy JSON array).
+
+    Keyed on (path, mtime) so Streamlit reruns reuse the parsed list until
+    the file actually changes; the save path clears this cache explicitly.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if path.endswith(".ndjson"):
+        # one record per line
+        return [_jloads(line) for line in raw.splitlines() if line.strip()]
+    data = _jloads(raw)
+    if isinstance(data, list):
+        return data
+    elif isinstance(data, dict):
+        return [data]
+    else:
+        return []
+
+
+@st.cache_data(ttl="5m", max_entries=8, show_spinner=False)
+def _stored_csv_bytes(path: str, mtime: float) -> bytes:
+    """CSV rendering of the saved records, cached per file version.
+
+    pandas' C-level writer serializes the whole table in one pass and
+    handles the header union (in first-seen order) itself.
+    """
+    rows = [r for r in _load_saved_records(path, mtime) if isinstance(r, dict)]
+    if not rows:
+        return b""
+    return pd.DataFrame(rows).to_csv(index=False).encode("utf-8")
+
+
+@st.cache_data(ttl="5m", max_entries=8, show_spinner=False)
+def _raw_saved_bytes(path: str, mtime: float) -> bytes:
+    """Raw file bytes for the download button, cached per file version."""
+    return Path(path).read_bytes()
+
+
+@st.cache_data(ttl="5m", max_entries=8, show_spinner=False)
+def _saved_df(path: str, mtime: float):
+    """Saved records as a DataFrame, cached per file version.
+
+    st.dataframe serializes a prebuilt frame straight to Arrow; handing it
+    the raw list-of-dicts would redo pandas type inference on every rerun.
+    """
+    return pd.DataFrame(_load_saved_records(path, mtime))
+
+
+@st.fragment
+def _saved_records_fragment(target: Path):
+    """Right-column view of the saved test cases.
+
+    Runs as a fragment: the Refresh button reruns only this block instead of
+    the whole page script.
+    """
+    st.subheader("Saved test cases (from Reports/test_cases.ndjson)")
+    try:
+        saved = _load_saved_records(str(target), target.stat().st_mtime) if target.exists() else []
+    except Exception:
+        saved = []
+    if not saved:
+        st.info("No saved test cases found. Generate some from the form on the left.")
+    else:
+        try:
+            st.dataframe(_saved_df(str(target), target.stat().st_mtime))
+        except Exception:
+            st.json(saved)
+        # downloads for the saved file; both byte payloads come from
+        # cached producers keyed on the file version
+        try:
+            st.download_button(
+                "Download saved records (JSON Lines)",
+                data=_raw_saved_bytes(str(target), target.stat().st_mtime),
+                file_name=target.name,
+                mime="application/x-ndjson",
+            )
+            csv_bytes = _stored_csv_bytes(str(target), target.stat().st_mtime)
+            if csv_bytes:
+                st.download_button(
+                    "Download CSV (from saved records)",
+                    data=csv_bytes,
+                    file_name="test_cases.csv",
+                    mime="text/csv",
+                )
+        except Exception:
+            pass
+    if st.button("Refresh test cases"):
+        _load_saved_records.clear()
+        _stored_csv_bytes.clear()
+        _saved_df.clear()
+        _raw_saved_bytes.clear()
+        st.rerun(scope="fragment")
+
 
 def render():
     """Render the Test Case Generation page with a form that submits to an n8n webhook."""
@@ -22,59 +174,56 @@ def render():
     # Layout: form on the left, response table/download on the right
     left_col, right_col = st.columns([2, 3])
 
-    resp_text = None
-    resp_data = None
-    # prepare path to saved test cases JSON
-    repo_root = Path(__file__).resolve().parents[1]
-    reports_dir = repo_root / "Reports"
+    # prepare path to saved test cases; stored as JSON Lines so every save
+    # appends new records instead of rewriting the whole history
+    reports_dir = _REPORTS_DIR
     reports_dir.mkdir(parents=True, exist_ok=True)
-    target = reports_dir / "test_cases.json"
-
-    # helper: load saved records from JSON (normalize to list)
-    def load_saved_records():
-        if not target.exists():
-            return []
+    target = reports_dir / "test_cases.ndjson"
+    legacy = reports_dir / "test_cases.json"
+    if not target.exists() and legacy.exists():
+        # one-shot migration from the old array-based file
         try:
-            with target.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            if isinstance(data, list):
-                return data
-            elif isinstance(data, dict):
-                return [data]
-            else:
-                return []
+            old = _jloads(legacy.read_bytes())
+            if isinstance(old, dict):
+                old = [old]
+            if isinstance(old, list):
+                with open(target, "wb") as f:
+                    f.write(b"".join(_jdumpb(e) + b"\n" for e in old))
         except Exception:
-            return []
-    # initialize form variables so they always exist even if form isn't rendered for some reason
-    google_sheet = ""
-    module = ""
-    user_story = ""
-    dropdown = "tc"  # send static 'tc' value
-
-    # Right column: always show saved test cases loaded from Reports/test_cases.json
+            pass
+
+    # Right column: always show saved test cases loaded from Reports/test_cases.ndjson
     with right_col:
-        st.subheader("Saved test cases (from Reports/test_cases.json)")
-        saved = load_saved_records()
-        if not saved:
-            st.info("No saved test cases found. Generate some from the form on the left.")
-        else:
-            try:
-                st.dataframe(saved)
-            except Exception:
-                st.json(saved)
+        _saved_records_fragment(target)
 
     with left_col:
-        with st.form("tc_form"):
-            # bring User Story to first place
-            user_story = st.text_area("User Story")
-            # OS changed to Google Sheet Link
-            google_sheet = st.text_input("Google Sheet Link")
-            module = st.text_input("Module")
-            # remove Summary placeholder (not shown)
-            # Type removed; send static 'tc' in payload
-            # st.write("Type: Test Case (sent as static)")
-
-            submitted = st.form_submit_button("Submit to n8n")
+        _submit_form_fragment()
+        # the poller only auto-reruns while a submission is in flight; at
+        # idle it is mounted without run_every and costs nothing per tick
+        polling = "1s" if st.session_state.get("tc_future") is not None else None
+        st.fragment(run_every=polling)(_poll_submission)(target, reports_dir)
+        _response_fragment()
+
+
+@st.fragment
+def _submit_form_fragment():
+    """Form plus submission hand-off, scoped to its own rerun.
+
+    Submitting reruns only this fragment: the payload goes to the worker
+    pool and the polling fragment picks the Future up within its next
+    tick, so the rest of the page is never re-executed for a submit.
+    """
+    with st.form("tc_form"):
+        # bring User Story to first place
+        user_story = st.text_area("User Story")
+        # OS changed to Google Sheet Link
+        google_sheet = st.text_input("Google Sheet Link")
+        module = st.text_input("Module")
+        # remove Summary placeholder (not shown)
+        # Type removed; send static 'tc' in payload
+        # st.write("Type: Test Case (sent as static)")
+
+        submitted = st.form_submit_button("Submit to n8n")
 
     if submitted:
         # Build payload: send Google Sheet Link, Module, User Story and static TC value
@@ -86,287 +235,318 @@ def render():
             "dropdown": "tc",
         }
 
-        # Send JSON payload to the webhook
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            WEBHOOK_URL,
-            data=data,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-
-        # Run the network request in a background thread and poll with a progress bar
-        def do_request(r):
-            with urllib.request.urlopen(r, timeout=60) as resp:
-                return resp.read().decode("utf-8").strip()
-
-        future = None
+        # Hand the blocking POST to a worker thread and keep the Future in
+        # session state; a pending submission is never replaced.
+        if st.session_state.get("tc_future") is None:
+            st.session_state["tc_future"] = _executor().submit(_post_webhook, payload)
+            st.session_state["tc_error"] = None
+            # full rerun so render() remounts the poller with run_every on
+            st.rerun(scope="app")
+        else:
+            st.warning("A submission is already in flight; wait for it to finish.")
+
+
+def _persist_response(resp_data, target: Path, reports_dir: Path):
+    """Assign IDs, dedupe against history and append the new records."""
+    try:
+        # Existing history comes from the mtime-keyed cache; it is
+        # only consulted, never rewritten
         try:
-            # place a small progress bar in a narrow sub-column to keep it compact
-            pcol, _ = left_col.columns([1, 6])
-            pbar = pcol.progress(0)
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(do_request, req)
-
-                start = time.time()
-                timeout_seconds = 60
-                interval = 0.5
-                while True:
-                    if future.done():
-                        break
-                    elapsed = time.time() - start
-                    frac = min(1.0, elapsed / timeout_seconds)
-                    pbar.progress(int(frac * 100))
-                    if elapsed >= timeout_seconds:
-                        break
-                    time.sleep(interval)
-
-                # Attempt to get result (may raise exceptions from the worker)
-                try:
-                    resp_text = future.result(timeout=0)
-                except concurrent.futures.TimeoutError:
-                    # timed out waiting for result after polling
-                    st.error("Timed out waiting for webhook response (60s).")
-                    return
-
-            # mark progress complete when we have the response
-            try:
-                pbar.progress(100)
-            except Exception:
-                pass
-        except urllib.error.HTTPError as e:
-            st.error(f"Request failed: {e.code} {e.reason}")
-            return
-        except (urllib.error.URLError, socket.timeout) as e:
-            st.error(f"Network error or timeout when contacting the webhook: {e}")
-            return
-
-        if resp_text:
+            existing = _load_saved_records(str(target), target.stat().st_mtime) if target.exists() else []
+        except Exception:
+            existing = []
+
+        # Normalize new entries to a list
+        if isinstance(resp_data, dict):
+            new_entries = [resp_data]
+        elif isinstance(resp_data, list):
+            new_entries = resp_data
+        else:
+            new_entries = []
+
+        # Determine Test Case ID prefix and max existing number.
+        # The meta sidecar keeps this O(1) per save; the scan below runs
+        # only as one-shot work — migrating files that predate the sidecar
+        # and/or seeding the session's dedupe sets — and a single pass over
+        # `existing` serves both needs.
+        meta_path = reports_dir / "test_cases_meta.json"
+        prefix = None
+        max_num = 0
+        have_meta = meta_path.exists()
+        seen_ticket = st.session_state.get("_seen_ticket")
+        seen_tcid = st.session_state.get("_seen_tcid")
+        need_seed = seen_ticket is None
+        if need_seed:
+            seen_ticket = set()
+            seen_tcid = set()
+        try:
+            if have_meta:
+                meta = _jloads(meta_path.read_bytes())
+                prefix = meta.get("prefix") or "TC"
+                max_num = int(meta.get("max_num", 0))
+            if not have_meta or need_seed:
+                prefixes = Counter()
+                match = _TCID_RE.match
+                saw_sg = False
+                for item in existing:
+                    if not isinstance(item, dict):
+                        continue
+                    if need_seed:
+                        ticket = item.get("ticketId")
+                        if ticket is not None:
+                            seen_ticket.add(ticket)
+                    # only fall back to the alternate key when the
+                    # primary one is missing/non-string; the common
+                    # case pays a single dict lookup
+                    tcid = item.get("Test Case ID")
+                    if not isinstance(tcid, str):
+                        tcid = item.get("TestCaseID")
+                        if not isinstance(tcid, str):
+                            continue
+                    if need_seed:
+                        seen_tcid.add(tcid)
+                    if have_meta:
+                        continue
+                    if not saw_sg and tcid.startswith("SG_"):
+                        saw_sg = True
+                    m = match(tcid)
+                    if m:
+                        prefixes[m.group(1)] += 1
+                        n = int(m.group(2))
+                        if n > max_num:
+                            max_num = n
+
+                # pick the most common prefix if any, else default to 'SG'
+                # if seen during the same scan, otherwise 'TC'
+                if not have_meta:
+                    if prefixes:
+                        prefix = prefixes.most_common(1)[0][0]
+                    else:
+                        prefix = "SG" if saw_sg else "TC"
+        except Exception:
+            prefix = prefix or "TC"
+        if need_seed:
+            st.session_state["_seen_ticket"] = seen_ticket
+            st.session_state["_seen_tcid"] = seen_tcid
+
+        # Assign Test Case ID to new entries that don't have one
+        try:
+            next_num = max_num + 1
+            for entry in new_entries:
+                if not isinstance(entry, dict):
+                    continue
+                tcid = entry.get("Test Case ID") or entry.get("TestCaseID")
+                if not tcid:
+                    entry["Test Case ID"] = f"{prefix}_{next_num}"
+                    next_num += 1
+        except Exception:
+            pass
+
+        # Basic dedupe by `ticketId` or `Test Case ID` when available
+        # (first occurrence wins). The seen-sets were seeded above in the
+        # same pass as the prefix scan; each save only checks the incoming
+        # batch — O(new), not O(N)
+        try:
+            to_append = []
+            for item in new_entries:
+                if not isinstance(item, dict):
+                    to_append.append(item)
+                    continue
+
+                ticket = item.get("ticketId")
+                tcid = item.get("Test Case ID")
+
+                # if ticketId present and seen, skip
+                if ticket is not None:
+                    if ticket in seen_ticket:
+                        continue
+                    seen_ticket.add(ticket)
+
+                # if Test Case ID present and seen, skip
+                if tcid is not None:
+                    if tcid in seen_tcid:
+                        continue
+                    seen_tcid.add(tcid)
+
+                to_append.append(item)
+        except Exception:
+            to_append = new_entries
+
+        # Append-only write: one buffered write (+fsync) whose cost
+        # scales with the new entries, not with the history size
+        if to_append:
+            buf = b"".join(_jdumpb(e) + b"\n" for e in to_append)
+            with open(target, "ab") as f:
+                f.write(buf)
+                f.flush()
+                os.fsync(f.fileno())
+        # keep the sidecar in sync so the next save skips the scan. Fold in
+        # the numeric suffixes of everything appended — entries can arrive
+        # from the webhook with their own Test Case ID above next_num, and
+        # missing those would let a later auto-assigned ID collide (and get
+        # silently dropped by the dedupe)
+        try:
+            final_max = next_num - 1
+            match = _TCID_RE.match
+            for entry in to_append:
+                if not isinstance(entry, dict):
+                    continue
+                tcid = entry.get("Test Case ID")
+                if not isinstance(tcid, str):
+                    tcid = entry.get("TestCaseID")
+                    if not isinstance(tcid, str):
+                        continue
+                m = match(tcid)
+                if m:
+                    n = int(m.group(2))
+                    if n > final_max:
+                        final_max = n
+            with tempfile.NamedTemporaryFile("wb", delete=False, dir=str(reports_dir)) as mf:
+                mf.write(_jdumpb({"prefix": prefix, "max_num": final_max}))
+                metaname = mf.name
+            os.replace(metaname, str(meta_path))
+        except Exception:
+            pass
+        # drop the cached parse/serialization so the next load
+        # sees the new file
+        _load_saved_records.clear()
+        _stored_csv_bytes.clear()
+        _saved_df.clear()
+        _raw_saved_bytes.clear()
+        st.session_state["tc_save_msg"] = ("info", f"Saved webhook response to: {target}")
+    except Exception as e:
+        st.session_state["tc_save_msg"] = ("warning", f"Could not save webhook response to disk: {e}")
+
+
+def _poll_submission(target: Path, reports_dir: Path):
+    """Consume the in-flight webhook Future and stash its outcome.
+
+    render() mounts this as a fragment with run_every="1s" only while a
+    Future is pending, so the page stays interactive during the POST and
+    idle sessions never tick. The outcome — response or error text — goes
+    to session state and the full rerun triggered below both stops the
+    polling and lets _response_fragment draw it persistently.
+    """
+    fut = st.session_state.get("tc_future")
+    if fut is None:
+        return
+    if not fut.done():
+        st.info("Waiting for webhook response...")
+        return
+    st.session_state["tc_future"] = None
+    try:
+        resp_text = fut.result()
+    except requests.exceptions.HTTPError as e:
+        st.session_state["tc_error"] = f"Request failed: {e.response.status_code} {e.response.reason}"
+    except requests.exceptions.RequestException as e:
+        st.session_state["tc_error"] = f"Network error or timeout when contacting the webhook: {e}"
+    else:
+        if not resp_text:
+            st.session_state["tc_error"] = "Webhook returned an empty response."
+        else:
             # Try to parse JSON
             try:
-                resp_data = json.loads(resp_text)
+                resp_data = _jloads(resp_text)
             except Exception:
                 resp_data = None
 
-            # Show a success message (toast-like)
-            st.success("Submission successful.")
+            st.session_state["tc_error"] = None
+            st.session_state["tc_response"] = (resp_text, resp_data)
 
             # Persist JSON responses so other pages can use them.
             # We only persist when we successfully parsed JSON into resp_data.
             if resp_data is not None:
-                try:
-                    # Load existing data (if any) and normalize to a list
-                    existing = []
-                    if target.exists():
-                        try:
-                            with target.open("r", encoding="utf-8") as f:
-                                existing = json.load(f)
-                                if not isinstance(existing, list):
-                                    existing = [existing]
-                        except Exception:
-                            existing = []
-
-                    # Normalize new entries to a list
-                    if isinstance(resp_data, dict):
-                        new_entries = [resp_data]
-                    elif isinstance(resp_data, list):
-                        new_entries = resp_data
-                    else:
-                        new_entries = []
-
-                    # Determine Test Case ID prefix and max existing number
-                    prefix = None
-                    max_num = 0
-                    try:
-                        import re
-
-                        prefixes = {}
-                        for item in existing:
-                            if isinstance(item, dict):
-                                tcid = item.get("Test Case ID") or item.get("TestCaseID")
-                                if isinstance(tcid, str):
-                                    m = re.match(r"([^_]+)_?(\d+)$", tcid)
-                                    if m:
-                                        p = m.group(1)
-                                        n = int(m.group(2))
-                                        prefixes[p] = prefixes.get(p, 0) + 1
-                                        if n > max_num:
-                                            max_num = n
-
-                        # pick the most common prefix if any, else default to 'SG' if present, otherwise 'TC'
-                        if prefixes:
-                            prefix = max(prefixes.items(), key=lambda kv: kv[1])[0]
-                        else:
-                            prefix = "SG" if any("SG_" in (str(item.get("Test Case ID")) if isinstance(item, dict) else "" for item in existing) ) else "TC"
-                    except Exception:
-                        prefix = "TC"
-
-                    # Assign Test Case ID to new entries that don't have one
-                    try:
-                        next_num = max_num + 1
-                        for entry in new_entries:
-                            if not isinstance(entry, dict):
-                                continue
-                            tcid = entry.get("Test Case ID") or entry.get("TestCaseID")
-                            if not tcid:
-                                entry["Test Case ID"] = f"{prefix}_{next_num}"
-                                next_num += 1
-                    except Exception:
-                        pass
+                _persist_response(resp_data, target, reports_dir)
+    st.rerun(scope="app")
+
+
+@st.fragment
+def _response_fragment():
+    """Latest submission outcome plus the automation panel.
+
+    A plain fragment (no run_every): the persisted outcome is redrawn on
+    every rerun instead of being wiped by a polling tick, and automation
+    reruns stay scoped to this block.
+    """
+    err = st.session_state.get("tc_error")
+    if err:
+        st.error(err)
+        return
+
+    stored = st.session_state.get("tc_response")
+    if stored is None:
+        return
+    resp_text, resp_data = stored
+
+    st.success("Submission successful.")
+    save_msg = st.session_state.get("tc_save_msg")
+    if save_msg:
+        kind, msg = save_msg
+        (st.warning if kind == "warning" else st.info)(msg)
+
+    # Compact webhook response and Automation UI (avoid duplicate table)
+    st.subheader("Webhook response (latest)")
+    if resp_data is None:
+        st.warning("Response is not valid JSON; showing raw text.")
+        st.code(resp_text)
+    else:
+        # show compact JSON (not a large table) to avoid duplicating saved-table view
+        try:
+            st.json(resp_data)
+        except Exception:
+            st.code(json.dumps(resp_data, ensure_ascii=False))
 
-                    combined = existing + new_entries
+    # --- Automation UI: Run automation using the API response data ---
+    st.markdown("---")
+    st.subheader("Automation")
+    script = st.file_uploader("Upload automation script (optional)", key="automation_script")
 
-                    # Basic dedupe by `ticketId` or `Test Case ID` when available (keep first occurrence)
+    if st.button("Start Automation"):
+        if resp_data is None:
+            st.error("No API response available to automate. Submit the form first.")
+        else:
+            # Use response data (dict or list) as automation instructions / test cases
+            entries = resp_data if isinstance(resp_data, list) else [resp_data]
+            total = len(entries)
+            if total == 0:
+                st.warning("No entries found in the API response to automate.")
+            else:
+                prog = st.progress(0)
+                log_box = st.empty()
+                success_count = 0
+                fail_count = 0
+                # Batch UI pushes: every log_box/progress call is a websocket
+                # frame to the browser, so cap the run at ~100 updates and
+                # keep only the latest lines in a bounded deque
+                update_every = max(1, total // 100)
+                log_buf = deque(maxlen=20)
+                # one C-level draw for the whole run instead of a Python
+                # random.random() call per entry
+                passes = random.choices((True, False), weights=(0.85, 0.15), k=total)
+                for i, entry in enumerate(entries, start=1):
+                    # Best-effort extract a friendly name for the entry
+                    name = None
+                    if isinstance(entry, dict):
+                        name = entry.get("Test Case ID") or entry.get("testCaseId") or entry.get("title") or entry.get("name")
+                    if not name:
+                        name = f"entry {i}"
+
+                    # Placeholder execution: if user uploaded a script we could run it here.
+                    # For now, simulate execution with a short delay and random pass/fail result.
                     try:
-                        seen_ticket = set()
-                        seen_tcid = set()
-                        deduped = []
-                        for item in combined:
-                            if not isinstance(item, dict):
-                                deduped.append(item)
-                                continue
-
-                            ticket = item.get("ticketId")
-                            tcid = item.get("Test Case ID")
-
-                            # if ticketId present and seen, skip
-                            if ticket is not None:
-                                if ticket in seen_ticket:
-                                    continue
-                                seen_ticket.add(ticket)
-
-                            # if Test Case ID present and seen, skip
-                            if tcid is not None:
-                                if tcid in seen_tcid:
-                                    continue
-                                seen_tcid.add(tcid)
-
-                            deduped.append(item)
-
-                        combined = deduped
+                        time.sleep(0.5)
                     except Exception:
                         pass
 
-                    # Atomic write: write to a temp file then replace
-                    with tempfile.NamedTemporaryFile("w", delete=False, dir=str(reports_dir), encoding="utf-8") as tf:
-                        json.dump(combined, tf, ensure_ascii=False, indent=2)
-                        tempname = tf.name
-                    os.replace(tempname, str(target))
-                    st.info(f"Saved webhook response to: {target}")
-
-                    # Refresh right column view by reloading saved records and showing them
-                    with right_col:
-                        st.subheader("Saved test cases (from Reports/test_cases.json)")
-                        saved = load_saved_records()
-                        if not saved:
-                            st.info("No saved test cases found after save.")
-                        else:
-                            try:
-                                st.dataframe(saved)
-                            except Exception:
-                                st.json(saved)
-
-                        # add download buttons for the saved file
-                        try:
-                            raw_json = target.read_text(encoding="utf-8").encode("utf-8")
-                            st.download_button(
-                                "Download saved JSON",
-                                data=raw_json,
-                                file_name="test_cases.json",
-                                mime="application/json",
-                            )
-
-                            # CSV
-                            import io, csv
-                            headers = []
-                            seen = set()
-                            for r in saved:
-                                if isinstance(r, dict):
-                                    for k in r.keys():
-                                        if k not in seen:
-                                            seen.add(k)
-                                            headers.append(k)
-
-                            if headers:
-                                output = io.StringIO()
-                                writer = csv.DictWriter(output, fieldnames=headers)
-                                writer.writeheader()
-                                for r in saved:
-                                    if isinstance(r, dict):
-                                        writer.writerow({k: r.get(k, "") for k in headers})
-                                csv_bytes = output.getvalue().encode("utf-8")
-                                st.download_button(
-                                    "Download CSV (from saved JSON)",
-                                    data=csv_bytes,
-                                    file_name="test_cases.csv",
-                                    mime="text/csv",
-                                )
-                        except Exception:
-                            pass
-                except Exception as e:
-                    st.warning(f"Could not save webhook response to disk: {e}")
-
-            # Compact webhook response and Automation UI on the left column (avoid duplicate table)
-            with left_col:
-                st.subheader("Webhook response (latest)")
-                if resp_data is None:
-                    st.warning("Response is not valid JSON; showing raw text.")
-                    st.code(resp_text)
-                else:
-                    # show compact JSON (not a large table) to avoid duplicating saved-table view
-                    try:
-                        st.json(resp_data)
-                    except Exception:
-                        st.code(json.dumps(resp_data, ensure_ascii=False))
-
-                # --- Automation UI: Run automation using the API response data ---
-                st.markdown("---")
-                st.subheader("Automation")
-                script = st.file_uploader("Upload automation script (optional)", key="automation_script")
-
-                if st.button("Start Automation"):
-                    if resp_data is None:
-                        st.error("No API response available to automate. Submit the form first.")
+                    if passes[i - 1]:
+                        log_buf.append(f"\u2705 {name}: PASSED")
+                        success_count += 1
                     else:
-                        # Use response data (dict or list) as automation instructions / test cases
-                        entries = resp_data if isinstance(resp_data, list) else [resp_data]
-                        total = len(entries)
-                        if total == 0:
-                            st.warning("No entries found in the API response to automate.")
-                        else:
-                            prog = st.progress(0)
-                            log_box = st.empty()
-                            success_count = 0
-                            fail_count = 0
-                            for i, entry in enumerate(entries, start=1):
-                                # Best-effort extract a friendly name for the entry
-                                name = None
-                                if isinstance(entry, dict):
-                                    name = entry.get("Test Case ID") or entry.get("testCaseId") or entry.get("title") or entry.get("name")
-                                if not name:
-                                    name = f"entry {i}"
-
-                                log_box.write(f"Running automation for {name} ...")
-
-                                # Placeholder execution: if user uploaded a script we could run it here.
-                                # For now, simulate execution with a short delay and random pass/fail result.
-                                try:
-                                    time.sleep(0.5)
-                                except Exception:
-                                    pass
-
-                                passed = random.random() > 0.15
-                                if passed:
-                                    log_box.write(f"✅ {name}: PASSED")
-                                    success_count += 1
-                                else:
-                                    log_box.write(f"❌ {name}: FAILED")
-                                    fail_count += 1
-
-                                prog.progress(int(i / total * 100))
-
-                            st.success(f"Automation finished — {success_count} passed, {fail_count} failed.")
+                        log_buf.append(f"\u274c {name}: FAILED")
+                        fail_count += 1
 
-        else:
-            st.error("Webhook returned an empty response.")
+                    if i % update_every == 0 or i == total:
+                        log_box.write("\n".join(log_buf))
+                        prog.progress(int(i / total * 100))
+
+                st.success(f"Automation finished \u2014 {success_count} passed, {fail_count} failed.")